@@ -1,9 +1,10 @@
-from typing import List, Tuple, Dict, Optional, Set, NamedTuple
+from typing import List, Tuple, Dict, Callable, Iterable, Iterator, Optional, NamedTuple
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+import copy
 import random
-from collections import defaultdict
+from array import array
 
 class Suit(Enum):
     HEARTS = auto()
@@ -14,6 +15,9 @@ class Suit(Enum):
     def __str__(self):
         return self.name[0]
 
+# Point values by card value; every other card is worth nothing
+CARD_POINTS: Dict[int, int] = {5: 5, 10: 10, 14: 15}
+
 class CardValue(Enum):
     FIVE = 5
     SIX = 6
@@ -26,116 +30,260 @@ class CardValue(Enum):
     KING = 13
     ACE = 14
     
-    @property
-    def points(self) -> int:
-        """Calculate point value of card"""
-        if self.value == 5:
-            return 5
-        elif self.value == 10:
-            return 10
-        elif self.value == 14:
-            return 15
-        return 0
-
-@dataclass(frozen=True)
+    def __init__(self, value: int):
+        self.points = CARD_POINTS.get(value, 0)
+
+# Integer card encoding: card id = suit_index * SUIT_SIZE + value_index
+SUITS: Tuple[Suit, ...] = tuple(Suit)
+VALUES: Tuple[CardValue, ...] = tuple(CardValue)
+SUIT_SIZE = len(VALUES)
+SUIT_INDEX: Dict[Suit, int] = {suit: i for i, suit in enumerate(SUITS)}
+VALUE_INDEX: Dict[CardValue, int] = {value: i for i, value in enumerate(VALUES)}
+
+@dataclass(frozen=True, slots=True)
 class Card:
     suit: Suit
     value: CardValue
+    id: int = field(init=False, repr=False, compare=False)
+    points: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'id', SUIT_INDEX[self.suit] * SUIT_SIZE + VALUE_INDEX[self.value])
+        object.__setattr__(self, 'points', self.value.points)
     
     def __str__(self):
         return f"{self.value.value}{self.suit}"
+
+CARDS: Tuple[Card, ...] = tuple(Card(suit, value) for suit in SUITS for value in VALUES)
+CARD_BITS: Tuple[int, ...] = tuple(1 << card_id for card_id in range(len(CARDS)))
+PTS = array('b', [card.points for card in CARDS])
+
+# Trick ranking: WIN_RANK[trump][led_suit][card] is highest for the winning card,
+# so resolving a trick is an integer max. Off-suit cards never beat the led card.
+LED_BONUS = 1 << 4
+TRUMP_BONUS = 1 << 5
+WIN_RANK: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+    tuple(
+        tuple(
+            card_id % SUIT_SIZE
+            + (TRUMP_BONUS if card_id // SUIT_SIZE == trump else 0)
+            + (LED_BONUS if card_id // SUIT_SIZE == led_suit else 0)
+            for card_id in range(len(CARDS))
+        )
+        for led_suit in range(len(SUITS))
+    )
+    for trump in range(len(SUITS))
+)
+
+def trick_points(cards: List[int]) -> int:
+    """Total points of a trick given as card ids"""
+    return sum(map(PTS.__getitem__, cards))
+
+def trick_winner(cards: List[int], leader: int, trump: int) -> int:
+    """Player who wins a non-empty trick of card ids led by `leader`"""
+    rank = WIN_RANK[trump][cards[0] // SUIT_SIZE]
     
-    @property
-    def points(self) -> int:
-        return self.value.points
+    if len(cards) == 4:
+        # Full trick: unrolled compares beat building keys for max()
+        best_rank = rank[cards[0]]
+        offset = 0
+        card_rank = rank[cards[1]]
+        if card_rank > best_rank:
+            best_rank = card_rank
+            offset = 1
+        card_rank = rank[cards[2]]
+        if card_rank > best_rank:
+            best_rank = card_rank
+            offset = 2
+        if rank[cards[3]] > best_rank:
+            offset = 3
+        return (leader + offset) & 3
+    
+    # Each key packs (rank << 2) | player, so the largest key carries the winner
+    return max(rank[card_id] << 2 | (leader + i) & 3 for i, card_id in enumerate(cards)) & 3
+
+def resolve_trick(cards: List[int], leader: int, trump: int) -> int:
+    """Winner and points of a non-empty trick, packed as (winner << 8) | points"""
+    return trick_winner(cards, leader, trump) << 8 | trick_points(cards)
 
 class Bid(NamedTuple):
     player_id: int
     amount: int
 
-@dataclass
+@dataclass(slots=True)
 class Trick:
-    cards: List[Card]
+    cards: List[int]  # card ids, in play order
     leader: int
     trump_suit: Suit
     
     @property
     def points(self) -> int:
-        return sum(card.points for card in self.cards)
+        return trick_points(self.cards)
     
     @property
     def winner(self) -> int:
         if not self.cards:
             return self.leader
-            
-        led_suit = self.cards[0].suit
-        winning_card = self.cards[0]
-        winner = self.leader
-        
-        for i, card in enumerate(self.cards[1:], 1):
-            player = (self.leader + i) % 4
-            # Trump wins over led suit
-            if card.suit == self.trump_suit and winning_card.suit != self.trump_suit:
-                winning_card = card
-                winner = player
-            # Higher trump beats lower trump
-            elif card.suit == self.trump_suit and winning_card.suit == self.trump_suit:
-                if card.value.value > winning_card.value.value:
-                    winning_card = card
-                    winner = player
-            # Higher card of led suit beats lower card of led suit
-            elif card.suit == led_suit and winning_card.suit == led_suit:
-                if card.value.value > winning_card.value.value:
-                    winning_card = card
-                    winner = player
-                    
-        return winner
+        return trick_winner(self.cards, self.leader, SUIT_INDEX[self.trump_suit])
+
+SUIT_MASK = (1 << SUIT_SIZE) - 1
+
+def _suit_masters(suit_mask: int) -> int:
+    """Number of cards held in an unbroken run down from the ace"""
+    count = 0
+    bit = 1 << (SUIT_SIZE - 1)
+    while suit_mask & bit:
+        count += 1
+        bit >>= 1
+    return count
+
+def _suit_points_table() -> array:
+    """Points held for every suit bitmask, each built from the mask minus its lowest bit"""
+    table = array('b', bytes(1 << SUIT_SIZE))
+    for suit_mask in range(1, 1 << SUIT_SIZE):
+        low_bit = suit_mask & -suit_mask
+        table[suit_mask] = table[suit_mask ^ low_bit] + VALUES[low_bit.bit_length() - 1].points
+    return table
+
+# Per-suit evaluation tables indexed by a suit's value bitmask (Hand.suits[i])
+SUIT_POINTS = _suit_points_table()
+SUIT_MASTERS = array('b', [_suit_masters(suit_mask) for suit_mask in range(1 << SUIT_SIZE)])
 
 class Hand:
-    def __init__(self, cards: List[Card]):
-        self.cards = sorted(cards, key=lambda c: (c.suit.value, c.value.value))
+    """Cards held as a bitmask over card ids, with a per-suit cache of value bits"""
+    __slots__ = ('mask', 'suits')
+    
+    def __init__(self, cards: Iterable[Card] = ()):
+        self.suits = [0] * len(SUITS)
+        mask = 0
+        for card in cards:
+            mask |= CARD_BITS[card.id]
+        self.set_mask(mask)
+    
+    @classmethod
+    def from_ids(cls, card_ids: Iterable[int]) -> 'Hand':
+        hand = cls()
+        mask = 0
+        for card_id in card_ids:
+            mask |= CARD_BITS[card_id]
+        hand.set_mask(mask)
+        return hand
+    
+    def set_mask(self, mask: int) -> None:
+        self.mask = mask
+        suits = self.suits
+        for suit in range(len(suits)):
+            suits[suit] = mask >> (suit * SUIT_SIZE) & SUIT_MASK
+    
+    def __iter__(self) -> Iterator[Card]:
+        """Cards in hand, ordered by suit then value (card id order)"""
+        mask = self.mask
+        while mask:
+            bit = mask & -mask
+            yield CARDS[bit.bit_length() - 1]
+            mask ^= bit
+    
+    @property
+    def cards(self) -> List[Card]:
+        return list(self)
+    
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+    
+    def __contains__(self, card: Card) -> bool:
+        return bool(self.mask >> card.id & 1)
     
     def remove_card(self, card: Card) -> None:
-        self.cards.remove(card)
+        card_id = card.id
+        if not self.mask >> card_id & 1:
+            raise ValueError(f"{card} not in hand")
+        self.mask ^= 1 << card_id
+        self.suits[card_id // SUIT_SIZE] ^= 1 << (card_id % SUIT_SIZE)
+    
+    @property
+    def points(self) -> int:
+        """Card points held in hand"""
+        return sum(map(SUIT_POINTS.__getitem__, self.suits))
+    
+    def masters(self, suit: Suit) -> int:
+        """Number of top cards of a suit held in sequence from the ace"""
+        return SUIT_MASTERS[self.suits[SUIT_INDEX[suit]]]
     
     def has_suit(self, suit: Suit) -> bool:
-        return any(card.suit == suit for card in self.cards)
+        return self.suits[SUIT_INDEX[suit]] != 0
+    
+    def legal_mask(self, led_suit: Optional[int]) -> int:
+        """Bitmask of card ids that may be played when `led_suit` (suit index) was led"""
+        if led_suit is None:
+            return self.mask
+        suit_mask = self.suits[led_suit]
+        return suit_mask << (led_suit * SUIT_SIZE) if suit_mask else self.mask
     
     def validate_play(self, card: Card, led_suit: Optional[Suit]) -> bool:
-        if card not in self.cards:
-            return False
-        if led_suit and self.has_suit(led_suit) and card.suit != led_suit:
-            return False
-        return True
+        led = SUIT_INDEX[led_suit] if led_suit is not None else None
+        return bool(self.legal_mask(led) >> card.id & 1)
 
 class GameState:
     def __init__(self):
-        self.scores: Dict[int, int] = {0: 0, 1: 0}
-        self.trick_points: Dict[int, int] = defaultdict(int)
-        self.played_cards: Set[Card] = set()
+        self.scores: List[int] = [0, 0]
+        self.trick_points: List[int] = [0, 0]
+        self.played_mask = 0  # bitmask of card ids played this hand
         self.current_trick: Optional[Trick] = None
         self.winning_bid: Optional[Bid] = None
         self.trump_suit: Optional[Suit] = None
         
+    def reset_hand(self) -> None:
+        """Clear per-hand state in place, keeping the running scores"""
+        self.trick_points[0] = self.trick_points[1] = 0
+        self.played_mask = 0
+        
     def add_trick_points(self, winner: int, points: int) -> None:
-        self.trick_points[winner % 2] += points
+        self.trick_points[winner & 1] += points
     
     def update_scores(self) -> None:
         if self.winning_bid:
-            bid_team = self.winning_bid.player_id % 2
-            if self.trick_points[bid_team] >= self.winning_bid.amount:
-                self.scores[bid_team] += self.trick_points[bid_team]
+            bid_team = self.winning_bid.player_id & 1
+            amount = self.winning_bid.amount
+            trick_points = self.trick_points
+            if trick_points[bid_team] >= amount:
+                self.scores[bid_team] += trick_points[bid_team]
             else:
-                self.scores[bid_team] -= self.winning_bid.amount
+                self.scores[bid_team] -= amount
             
             # Non-bidding team always gets their points
-            other_team = 1 - bid_team
-            self.scores[other_team] += self.trick_points[other_team]
+            self.scores[bid_team ^ 1] += trick_points[bid_team ^ 1]
+
+class EvalCache:
+    """Memoizes bot evaluations keyed by a card-id bitmask (e.g. the unplayed cards)"""
+    __slots__ = ('_values',)
+    
+    def __init__(self):
+        self._values: Dict[int, float] = {}
+    
+    def get(self, mask: int, compute: Callable[[int], float]) -> float:
+        """Return the cached value for `mask`, computing and storing it on first use"""
+        value = self._values.get(mask)
+        if value is None:
+            value = self._values[mask] = compute(mask)
+        return value
+    
+    def clear(self) -> None:
+        self._values.clear()
+    
+    def __len__(self) -> int:
+        return len(self._values)
 
 class Bot200(ABC):
     def __init__(self, player_id: int):
         self.player_id = player_id
-        self.team = player_id % 2
+        self.team = player_id & 1
+
+    def clone(self, player_id: int) -> 'Bot200':
+        """Shallow copy of this bot seated as `player_id`"""
+        bot = copy.copy(self)
+        bot.player_id = player_id
+        bot.team = player_id & 1
+        return bot
 
     @abstractmethod
     def make_bid(self, hand: Hand, game_state: GameState) -> Tuple[int, Suit]:
@@ -149,30 +297,38 @@ class Bot200(ABC):
 
 class Deck:
     def __init__(self):
-        self.cards = [
-            Card(suit, value)
-            for suit in Suit
-            for value in CardValue
-        ]
-    
-    def deal(self, num_players: int = 4) -> List[Hand]:
-        random.shuffle(self.cards)
-        hand_size = len(self.cards) // num_players
-        return [
-            Hand(self.cards[i * hand_size:(i + 1) * hand_size])
-            for i in range(num_players)
-        ]
+        self.card_ids = list(range(len(CARDS)))
+    
+    def deal(self, num_players: int = 4, hands: Optional[List[Hand]] = None) -> List[Hand]:
+        """Deal new hands, refilling `hands` in place when given"""
+        order = random.sample(self.card_ids, len(self.card_ids))
+        hand_size = len(order) // num_players
+        if hands is None:
+            return [
+                Hand.from_ids(order[i * hand_size:(i + 1) * hand_size])
+                for i in range(num_players)
+            ]
+        
+        for i, hand in enumerate(hands):
+            mask = 0
+            for card_id in order[i * hand_size:(i + 1) * hand_size]:
+                mask |= CARD_BITS[card_id]
+            hand.set_mask(mask)
+        return hands
 
 class Game200:
     def __init__(self, bot1: Bot200, bot2: Bot200):
-        self.bots = [
+        self.bots: Tuple[Bot200, ...] = (
             bot1,  # Player 0
             bot2,  # Player 1
-            Bot200(2),  # Player 2 (copy of bot1)
-            Bot200(3)   # Player 3 (copy of bot2)
-        ]
+            bot1.clone(2),  # Player 2 (copy of bot1)
+            bot2.clone(3)   # Player 3 (copy of bot2)
+        )
         self.game_state = GameState()
         self.deck = Deck()
+        # Reused across hands and tricks to avoid reallocating every round
+        self.hands = [Hand() for _ in range(len(self.bots))]
+        self._trick = Trick([], 0, SUITS[0])
 
     def _handle_bidding(self, hands: List[Hand]) -> Optional[Bid]:
         """Conduct bidding round and return winning bid"""
@@ -193,37 +349,43 @@ class Game200:
                 winning_bid = Bid(current_player, bid)
                 passes = 0
             
-            current_player = (current_player + 1) % 4
+            current_player = (current_player + 1) & 3
             
         return winning_bid if current_high_bid > 0 else None
 
     def play_trick(self, hands: List[Hand], leader: int) -> Trick:
         """Play out a single trick"""
-        trick = Trick([], leader, self.game_state.trump_suit)
-        current_player = leader
+        game_state = self.game_state
+        bots = self.bots
+        trick = self._trick
+        trick.leader = leader
+        trick.trump_suit = game_state.trump_suit
+        cards = trick.cards
+        cards.clear()
+        game_state.current_trick = trick
+        led_suit = None
         
-        for _ in range(4):
-            played_card = self.bots[current_player].play_card(
-                hands[current_player],
-                self.game_state
-            )
+        for i in range(4):
+            current_player = (leader + i) & 3
+            hand = hands[current_player]
+            played_card = bots[current_player].play_card(hand, game_state)
             
-            led_suit = trick.cards[0].suit if trick.cards else None
-            if not hands[current_player].validate_play(played_card, led_suit):
+            card_id = played_card.id
+            if not hand.legal_mask(led_suit) >> card_id & 1:
                 raise ValueError(f"Invalid play by player {current_player}")
+            if led_suit is None:
+                led_suit = card_id // SUIT_SIZE
             
-            trick.cards.append(played_card)
-            hands[current_player].remove_card(played_card)
-            self.game_state.played_cards.add(played_card)
-            current_player = (current_player + 1) % 4
+            cards.append(card_id)
+            hand.remove_card(played_card)
+            game_state.played_mask |= CARD_BITS[card_id]
             
         return trick
 
     def play_hand(self) -> None:
         """Play a single hand"""
-        hands = self.deck.deal()
-        self.game_state.trick_points.clear()
-        self.game_state.played_cards.clear()
+        hands = self.deck.deal(len(self.hands), self.hands)
+        self.game_state.reset_hand()
         
         # Bidding phase
         self.game_state.winning_bid = self._handle_bidding(hands)
@@ -238,18 +400,28 @@ class Game200:
         
         # Play tricks
         leader = self.game_state.winning_bid.player_id
-        for _ in range(len(hands[0].cards)):
+        trump = SUIT_INDEX[self.game_state.trump_suit]
+        for _ in range(len(hands[0])):
             trick = self.play_trick(hands, leader)
-            self.game_state.current_trick = trick
-            self.game_state.add_trick_points(trick.winner, trick.points)
-            leader = trick.winner
+            result = resolve_trick(trick.cards, leader, trump)
+            leader = result >> 8
+            self.game_state.add_trick_points(leader, result & 0xFF)
         
         self.game_state.update_scores()
 
     def play_game(self) -> Tuple[int, int]:
         """Play until one team reaches 200 points"""
-        while max(self.game_state.scores.values()) < 200:
+        scores = self.game_state.scores
+        while max(scores) < 200:
             self.play_hand()
             
-        winning_team = max(self.game_state.scores.items(), key=lambda x: x[1])[0]
-        return winning_team, self.game_state.scores[winning_team]
+        winning_team = 0 if scores[0] >= scores[1] else 1
+        return winning_team, scores[winning_team]
+
+def simulate(bot1: Bot200, bot2: Bot200, num_games: int) -> Tuple[int, int]:
+    """Play `num_games` games between two bots and return games won by each team"""
+    wins = [0, 0]
+    for _ in range(num_games):
+        winning_team, _ = Game200(bot1, bot2).play_game()
+        wins[winning_team] += 1
+    return wins[0], wins[1]